@@ -1,8 +1,11 @@
-from numpy import shape, zeros
+from numpy import asarray, shape, zeros
 from scipy.interpolate import interp1d
 from xarray import open_dataset
 
-from .xsec_aux_functions import calculate_xsec_fullmodel
+from .xsec_aux_functions import calculate_xsec_fullmodel, calculate_xsec_profile
+
+
+c0 = 299792458.0  # Speed of light [m s-1].
 
 
 class CrossSection(object):
@@ -15,6 +18,32 @@ class CrossSection(object):
         """
         self.formula = formula
         self.path = path
+        # Read the bands here, since reading netCDF files is not
+        # thread-safe and the absorption coefficients may be calculated in threads.
+        self._bands = []
+        with open_dataset(self.path) as xsec_data:
+            for m in xsec_data.bands.data:
+                arg = f"band{m}"
+                # frequency of data in [Hz]
+                freq_data = xsec_data[arg + "_fgrid"].data.transpose()
+                # fit coefficients of band m
+                coeffs_m = xsec_data[arg + "_coeffs"].data.transpose()
+                self._bands.append((freq_data, coeffs_m, freq_data.min(), freq_data.max()))
+
+    def _overlapping_bands(self, frequency):
+        """Finds the bands that overlap the input frequencies.
+
+        Args:
+            frequency: Numpy array of frequencies [Hz].
+
+        Yields:
+            Tuple containing the frequency grid [Hz], fit coefficients, and frequency
+            bounds [Hz] of a band that overlaps the input frequencies.
+        """
+        for band in self._bands:
+            # Bands outside of the input frequencies would only interpolate to zeros.
+            if band[3] >= frequency.min() and band[2] <= frequency.max():
+                yield band
 
     def absorption_coefficient(self, grid, temperature, pressure):
         """Calculates absorption cross sections.
@@ -27,22 +56,39 @@ class CrossSection(object):
         Returns:
             Numpy array of absorption cross sections in [m2].
         """
-        with open_dataset(self.path) as xsec_data:
-            # Convert desired wavenumber to frequency [Hz].
-            c0 = 299792458.0  # Speed of light [m s-1].
-            freq_user = grid * c0 * 100
-            xsec_user = zeros(shape(grid))
-            bands = xsec_data.bands.data
-            for m in bands:
-                arg = f"band{m}"
-                # frequency of data in [Hz]
-                freq_data = xsec_data[arg + "_fgrid"].data.transpose()
-                # fit coefficients of band m
-                coeffs_m = xsec_data[arg + "_coeffs"].data.transpose()
-                # Calculate the cross section on their internal frequency grid
-                xsec_temp = calculate_xsec_fullmodel(temperature, pressure, coeffs_m)
-                # Interpolate cross sections to user grid
-                f_int = interp1d(freq_data, xsec_temp, fill_value=0., bounds_error=False)
-                xsec_user_m = f_int(freq_user)
-                xsec_user = xsec_user + xsec_user_m
-            return xsec_user
+        # Convert desired wavenumber to frequency [Hz].
+        freq_user = grid * c0 * 100
+        xsec_user = zeros(shape(grid))
+        for freq_data, coeffs_m, _, _ in self._overlapping_bands(freq_user):
+            # Calculate the cross section on their internal frequency grid
+            xsec_temp = calculate_xsec_fullmodel(temperature, pressure, coeffs_m)
+            # Interpolate cross sections to user grid
+            f_int = interp1d(freq_data, xsec_temp, fill_value=0., bounds_error=False)
+            xsec_user_m = f_int(freq_user)
+            xsec_user = xsec_user + xsec_user_m
+        return xsec_user
+
+    def absorption_coefficient_profile(self, grid, temperature, pressure):
+        """Calculates absorption cross sections for a profile of atmospheric layers.
+
+        Args:
+            grid: Numpy array of wavenumbers [cm-1].
+            temperature: Numpy array of temperatures [K] (layer).
+            pressure: Numpy array of pressures [Pa] (layer).
+
+        Returns:
+            Numpy array of absorption cross sections in [m2] (layer, wavenumber).
+        """
+        temperature = asarray(temperature, dtype=float).ravel()
+        pressure = asarray(pressure, dtype=float).ravel()
+
+        # Convert desired wavenumber to frequency [Hz].
+        freq_user = grid * c0 * 100
+        xsec_user = zeros((temperature.size, grid.size))
+        for freq_data, coeffs_m, _, _ in self._overlapping_bands(freq_user):
+            # Calculate the cross sections of all layers on their internal frequency grid
+            xsec_temp = calculate_xsec_profile(temperature, pressure, coeffs_m)
+            # Interpolate cross sections to user grid
+            f_int = interp1d(freq_data, xsec_temp, axis=-1, fill_value=0., bounds_error=False)
+            xsec_user += f_int(freq_user)
+        return xsec_user
@@ -1,5 +1,5 @@
-from os import remove
-from os.path import join
+from shutil import copyfileobj
+from tempfile import TemporaryFile
 from urllib.request import urlopen
 from zipfile import ZipFile
 
@@ -8,9 +8,11 @@ url = "https://attachment.rrz.uni-hamburg.de/df514eed/coefficients.zip"
 
 
 def download(directory, name="tmp.zip"):
-    zipped = join(directory, name)
-    with urlopen(url) as result, open(zipped, "wb") as dl:
-        dl.write(result.read())
-    with ZipFile(zipped, "r") as f:
-        f.extractall(directory)
-    remove(zipped)
+    # Download the archive to an anonymous temporary file, which is removed
+    # automatically once it is closed.  The name argument is no longer used, but is
+    # kept so that existing callers still work.
+    with urlopen(url) as result, TemporaryFile() as zipped:
+        copyfileobj(result, zipped, 1 << 20)
+        zipped.seek(0)
+        with ZipFile(zipped, "r") as f:
+            f.extractall(directory)
@@ -8,7 +8,7 @@ absorption cross section data and for the calculations of the fit coefficients.
 
 Modified by menzel-gfdl.
 """
-from numpy import shape, sum, zeros
+from numpy import newaxis, shape, sum, zeros
 
 
 def calculate_xsec(temperature, pressure, coeffs):
@@ -119,3 +119,42 @@ def calculate_xsec_fullmodel(temperature, pressure, coeffs):
             xsec = xsec * w
 
     return xsec
+
+
+def calculate_xsec_profile(temperature, pressure, coeffs):
+    """
+    Function to calculate the absorption cross section from the fitted
+    coefficients for many atmospheric states at once, including the same
+    check for negative values as calculate_xsec_fullmodel.
+
+    Args:
+        temperature: Vector of temperatures [K].
+        pressure: Vector of pressures [Pa].
+        coeffs: matrix fit coefficients.
+
+    Returns:
+        Matrix of absorption cross section in [m2] (state, frequency).
+    """
+
+    # evaluate the 2d quadratic fit z = p00 + p10*x + p01*y + p20*x*x for every
+    # state, where x = T and y = P
+    xsec = coeffs[0] + temperature[:, newaxis]*coeffs[1] + pressure[:, newaxis]*coeffs[2] + \
+        (temperature*temperature)[:, newaxis]*coeffs[3]
+
+    # Check for negative values and remove them without introducing bias, meaning
+    # the integral over the spectrum of each state must not change.
+    logic = xsec < 0
+    negative = logic.any(axis=1)
+    if negative.any():
+
+        # original sum over spectrum
+        sumx_org = sum(xsec, axis=1)
+
+        # remove negative values
+        xsec[logic] = 0
+
+        # scale altered spectra whose original sum was not negative
+        scale = negative & (sumx_org >= 0)
+        xsec[scale] *= (sumx_org[scale] / sum(xsec[scale], axis=1))[:, newaxis]
+
+    return xsec
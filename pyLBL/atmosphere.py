@@ -27,6 +27,8 @@ class Atmosphere(object):
         temperature: xarray DataArray object for temperature [K].
         gases: Dictionary of xarray DataArray objects for gas mole fractions [mol mol-1].
     """
+    __slots__ = ("dataset", "gases", "pressure", "temperature")
+
     def __init__(self, dataset, mapping=None):
         """Initializes an atmosphere object by reading data from an input xarray Dataset.
 
@@ -38,20 +40,35 @@ class Atmosphere(object):
 
         # Find the pressure, temperature and gax mixing ratio variables.
         if mapping is None:
-            self.pressure = _find_variable(dataset, "air_pressure")
-            self.temperature = _find_variable(dataset, "air_temperature")
-            self.gases = {x: y for x, y in _gases(dataset)}
+            standard_names = _standard_names(dataset)
+            self.pressure = _find_variable(standard_names, "air_pressure")
+            self.temperature = _find_variable(standard_names, "air_temperature")
+            self.gases = {x: y for x, y in _gases(standard_names)}
         else:
             self.pressure = dataset[mapping["play"]]
             self.temperature = dataset[mapping["tlay"]]
             self.gases = {x: dataset[y] for x, y in mapping["mole_fraction"].items()}
 
 
-def _find_variable(dataset, standard_name):
-    """Finds a variable in a dataset by its standard name attribute.
+def _standard_names(dataset):
+    """Reads the standard name attribute of the variables in a dataset.
 
     Args:
         dataset: xarray Dataset.
+
+    Returns:
+        List of string standard name and xarray DataArray pairs, for the variables that
+        have a standard name attribute.
+    """
+    return [(var.attrs["standard_name"], var) for var in dataset.data_vars.values()
+            if "standard_name" in var.attrs]
+
+
+def _find_variable(standard_names, standard_name):
+    """Finds a variable in a dataset by its standard name attribute.
+
+    Args:
+        standard_names: List of standard name and xarray DataArray pairs.
         standard_name: String standard name.
 
     Returns:
@@ -60,28 +77,22 @@ def _find_variable(dataset, standard_name):
     Raises:
         ValueError if standard name is not found in the dataset.
     """
-    for var in dataset.data_vars.values():
-        try:
-            if var.attrs["standard_name"] == standard_name:
-                return var
-        except KeyError:
-            continue
+    for name, var in standard_names:
+        if name == standard_name:
+            return var
     raise ValueError(f"{standard_name} standard name not found in dataset.")
 
 
-def _gases(dataset):
+def _gases(standard_names):
     """Finds variables that represent gas mole fractions.
 
     Args:
-        dataset: xarray Dataset.
+        standard_names: List of standard name and xarray DataArray pairs.
 
     Yields:
         Gas name (i.e. "H2O") and xarray DataArray.
     """
-    for var in dataset.data_vars.values():
-        try:
-            m = match("mole_fraction_of_([A-Za-z0-9_]+)?_in_air", var.attrs["standard_name"])
-        except KeyError:
-            continue
+    for name, var in standard_names:
+        m = match("mole_fraction_of_([A-Za-z0-9_]+)?_in_air", name)
         if m:
             yield _standard_name_to_formula[m.group(1)], var
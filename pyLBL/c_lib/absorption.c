@@ -15,19 +15,20 @@
 }
 
 
-/*Calculate absorption coefficient spectra.*/
-int absorption(double pressure, /*Pressure [Pa].*/
-               double temperature, /*Temperature [K].*/
-               double volume_mixing_ratio, /*Volume mixing ratio [mol mol-1].*/
-               int v0, /*Spectral grid lower bound (inclusive) [cm-1].*/
-               int vn, /*Spectral grid upper bound (inclusive) [cm-1].*/
-               int n_per_v, /*Number of spectral grid points per wavenumber.*/
-               double * k, /*Absorption coefficient [m-1].*/
-               char * database, /*Path to the database file.*/
-               char * formula, /*Molecue chemical formula.*/
-               int cut_off, /*Cut off from line center [cm-1].*/
-               int remove_pedestal /*Flag for removing the pedestal.*/
-              )
+/*Calculate absorption coefficient spectra for a profile of atmospheric layers.*/
+int absorption_profile(int num_layers, /*Number of atmospheric layers.*/
+                       double * pressure, /*Pressure [Pa] (layer).*/
+                       double * temperature, /*Temperature [K] (layer).*/
+                       double * volume_mixing_ratio, /*Volume mixing ratio [mol mol-1] (layer).*/
+                       int v0, /*Spectral grid lower bound (inclusive) [cm-1].*/
+                       int vn, /*Spectral grid upper bound (inclusive) [cm-1].*/
+                       int n_per_v, /*Number of spectral grid points per wavenumber.*/
+                       double * k, /*Absorption coefficient [m-1] (layer, wavenumber).*/
+                       char * database, /*Path to the database file.*/
+                       char * formula, /*Molecue chemical formula.*/
+                       int cut_off, /*Cut off from line center [cm-1].*/
+                       int remove_pedestal /*Flag for removing the pedestal.*/
+                      )
 {
     /*Spectral grid.*/
     double dv = 1./n_per_v;
@@ -38,7 +39,7 @@ int absorption(double pressure, /*Pressure [Pa].*/
     {
         v[i] = v0 + i*dv;
     }
-    memset(k, 0, sizeof(double)*n);
+    memset(k, 0, sizeof(double)*n*num_layers);
 
     /*Connect to database.*/
     sqlite3 * connection;
@@ -63,26 +64,32 @@ int absorption(double pressure, /*Pressure [Pa].*/
     memset(mass, 0, sizeof(double)*32);
     check(mass_data(connection, id, mass, 32));
 
-    /*Read the HITRAN line parameters.*/
-    char query[256];
-    snprintf(query, 256,
+    /*Read the HITRAN line parameters, only selecting lines whose cut-off window
+      overlaps the spectral grid.*/
+    char query[512];
+    snprintf(query, 512,
              "select nu, sw, gamma_air, gamma_self, n_air, elower, delta_air, "
-                 "local_iso_id from transition where molecule_id == %d",
-             id);
+                 "local_iso_id from transition where molecule_id == %d "
+                 "and nu >= %d and nu <= %d",
+             id, v0 - (cut_off + 1), vn + cut_off + 1);
     sqlite3_stmt * statement;
     compile_statement(connection, query, &statement);
 
-    /*Loop through the lines.*/
+    /*Store the lines in memory so they can be reused for every layer.  The terms that
+      do not depend on temperature are only calculated once per line.*/
+    int num_lines = 0;
+    int max_lines = 1024;
+    LineParameter_t * lines = malloc(sizeof(LineParameter_t)*max_lines);
     while (sqlite3_step(statement) != SQLITE_DONE)
     {
-        LineParameter_t parameter;
-        line_parameters(statement, &parameter, mass);
-        if (parameter.nu > vn + cut_off + 1 || parameter.nu < v0 - (cut_off + 1))
+        if (num_lines == max_lines)
         {
-            break;
+            max_lines *= 2;
+            lines = realloc(lines, sizeof(LineParameter_t)*max_lines);
         }
-        spectra(temperature, pressure, volume_mixing_ratio, parameter, tips,
-                v, n, n_per_v, k, cut_off, remove_pedestal);
+        line_parameters(statement, lines + num_lines, mass);
+        reference_terms(lines + num_lines, tips);
+        num_lines++;
     }
 
     /*Clean up clear statement so another query can be made.*/
@@ -91,9 +98,44 @@ int absorption(double pressure, /*Pressure [Pa].*/
     /*Close connection to the database.*/
     check(close_database(connection));
 
+    /*Loop through the layers and lines.  The layers write to separate parts of k, so
+      they can be calculated in parallel if compiled with OpenMP support.*/
+    int j;
+#ifdef _OPENMP
+#pragma omp parallel for private(i) schedule(dynamic)
+#endif
+    for (j=0; j<num_layers; ++j)
+    {
+        for (i=0; i<num_lines; ++i)
+        {
+            spectra(temperature[j], pressure[j], volume_mixing_ratio[j], lines[i], tips,
+                    v, n, n_per_v, k + j*n, cut_off, remove_pedestal);
+        }
+    }
+
     /*Clean up.*/
     free(v);
+    free(lines);
     free(tips.temperature);
     free(tips.data);
     return 0;
 }
+
+
+/*Calculate absorption coefficient spectra.*/
+int absorption(double pressure, /*Pressure [Pa].*/
+               double temperature, /*Temperature [K].*/
+               double volume_mixing_ratio, /*Volume mixing ratio [mol mol-1].*/
+               int v0, /*Spectral grid lower bound (inclusive) [cm-1].*/
+               int vn, /*Spectral grid upper bound (inclusive) [cm-1].*/
+               int n_per_v, /*Number of spectral grid points per wavenumber.*/
+               double * k, /*Absorption coefficient [m-1].*/
+               char * database, /*Path to the database file.*/
+               char * formula, /*Molecue chemical formula.*/
+               int cut_off, /*Cut off from line center [cm-1].*/
+               int remove_pedestal /*Flag for removing the pedestal.*/
+              )
+{
+    return absorption_profile(1, &pressure, &temperature, &volume_mixing_ratio, v0, vn,
+                              n_per_v, k, database, formula, cut_off, remove_pedestal);
+}
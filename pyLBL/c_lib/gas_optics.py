@@ -4,7 +4,7 @@ from ctypes import c_char_p, c_double, c_int, CDLL
 from glob import glob
 from pathlib import Path
 
-from numpy import zeros
+from numpy import ascontiguousarray, empty, float64
 from numpy.ctypeslib import ndpointer
 
 
@@ -26,6 +26,86 @@ def check_return_code(value):
     return value
 
 
+# Define argument types.
+library.absorption.argtypes = \
+    3*[c_double,] + \
+    3*[c_int,] + \
+    [ndpointer(c_double, flags="C_CONTIGUOUS"),] + \
+    2*[c_char_p,] + \
+    2*[c_int,]
+
+library.absorption_profile.argtypes = \
+    [c_int,] + \
+    3*[ndpointer(c_double, flags="C_CONTIGUOUS"),] + \
+    3*[c_int,] + \
+    [ndpointer(c_double, flags="C_CONTIGUOUS"),] + \
+    2*[c_char_p,] + \
+    2*[c_int,]
+
+# Set function to run on return.
+library.absorption.restype = check_return_code
+library.absorption_profile.restype = check_return_code
+
+
+def grid_bounds(grid):
+    """Calculates the spectral grid parameters expected by the c routines.
+
+    Args:
+        grid: Numpy array defining the spectral grid [cm-1].
+
+    Returns:
+        Grid lower bound [cm-1], grid upper bound [cm-1], and number of grid points
+        per wavenumber.
+    """
+    v0 = int(round(grid[0]))
+    vn = int(round(grid[-1]) + 1)
+    n_per_v = int(round(1./(grid[1] - grid[0])))
+    return v0, vn, n_per_v
+
+
+def _output_buffer(shape, size, out=None):
+    """Provides the array that the c routines write absorption coefficients to.
+
+    Args:
+        shape: Tuple shape of the absorption coefficients calculated by the c routines.
+        size: Number of points in the spectral grid.
+        out: Optional array provided by the user.
+
+    Returns:
+        Numpy array of the input shape.
+
+    Raises:
+        ValueError if the user provided array has neither the input shape, nor the
+        input shape with its last dimension replaced by the spectral grid size.
+    """
+    if out is None:
+        return empty(shape)
+    if out.shape == shape:
+        return out
+    if out.shape == shape[:-1] + (size,):
+        # The c routines calculate whole wavenumbers, so use a temporary array that
+        # is copied into out afterwards.
+        return empty(shape)
+    raise ValueError(f"out array has shape {out.shape}, but {shape[:-1] + (size,)}"
+                     f" or {shape} is required.")
+
+
+def _copy_output(k, out):
+    """Copies the absorption coefficients into the user provided array if necessary.
+
+    Args:
+        k: Numpy array of absorption coefficients written by the c routines.
+        out: Optional array provided by the user.
+
+    Returns:
+        Numpy array containing the absorption coefficients.
+    """
+    if out is None or out is k:
+        return k
+    out[...] = k[..., :out.shape[-1]]
+    return out
+
+
 class Gas(object):
     """API for gas optics calculation.
 
@@ -33,6 +113,8 @@ class Gas(object):
         database: String path to the spectral sqlite3 database.
         formula: String chemical formula.
     """
+    __slots__ = ("database", "formula", "_database_bytes", "_formula_bytes")
+
     def __init__(self, lines_database, formula):
         """Initializes the object.
 
@@ -42,9 +124,11 @@ class Gas(object):
         """
         self.database = lines_database.path
         self.formula = formula
+        self._database_bytes = bytes(self.database, encoding="utf-8")
+        self._formula_bytes = bytes(self.formula, encoding="utf-8")
 
     def absorption_coefficient(self, temperature, pressure, volume_mixing_ratio, grid,
-                               remove_pedestal=False, cut_off=25):
+                               remove_pedestal=False, cut_off=25, out=None):
         """Calculates absorption coefficient.
 
         Args:
@@ -54,28 +138,24 @@ class Gas(object):
             grid: Numpy array defining the spectral grid [cm-1].
             remove_pedestal: Flag specifying if a pedestal should be subtracted.
             cut_off: Wavenumber cut-off distance [cm-1] from line centers.
+            out: Optional contiguous numpy array that the result is written to, so that
+                 the same buffer can be reused across calls.  It may either have the
+                 size of the spectral grid, or the (vn - v0)*n_per_v points calculated
+                 by the c routines (see grid_bounds), which avoids a temporary copy.
 
         Returns:
-            Numpy array of absorption coefficients [m2].
+            Numpy array of absorption coefficients [m2].  Unless out is used, this
+            contains the (vn - v0)*n_per_v calculated points, which may extend past
+            the end of the spectral grid.
+
+        Raises:
+            ValueError if out does not have one of the allowed shapes.
         """
-        v0 = int(round(grid[0]))
-        vn = int(round(grid[-1]) + 1)
-        n_per_v = int(round(1./(grid[1] - grid[0])))
+        v0, vn, n_per_v = grid_bounds(grid)
         remove_pedestal = 1 if remove_pedestal else 0
-        k = zeros((vn - v0)*n_per_v)
-
-        # Define argument types.
-        library.absorption.argtypes = \
-            3*[c_double,] + \
-            3*[c_int,] + \
-            [ndpointer(c_double, flags="C_CONTIGUOUS"),] + \
-            2*[c_char_p,] + \
-            2*[c_int,]
+        k = _output_buffer(((vn - v0)*n_per_v,), grid.size, out)
 
-        # Set function to run on return.
-        library.absorption.restype = check_return_code
-
-        # Call the c function.
+        # Call the c function, which zeroes k before adding the lines to it.
         library.absorption(
             c_double(pressure),
             c_double(temperature),
@@ -84,9 +164,64 @@ class Gas(object):
             c_int(vn),
             c_int(n_per_v),
             k,
-            bytes(self.database, encoding="utf-8"),
-            bytes(self.formula, encoding="utf-8"),
+            self._database_bytes,
+            self._formula_bytes,
             c_int(cut_off),
             c_int(remove_pedestal),
         )
-        return k
+        return _copy_output(k, out)
+
+    def absorption_coefficient_profile(self, temperature, pressure, volume_mixing_ratio,
+                                       grid, remove_pedestal=False, cut_off=25, out=None):
+        """Calculates absorption coefficient for a profile of atmospheric layers.
+
+        The spectral database is only read once for all of the layers.
+
+        Args:
+            temperature: Numpy array of temperatures [K] (layer).
+            pressure: Numpy array of pressures [Pa] (layer).
+            volume_mixing_ratio: Numpy array of volume mixing ratios [mol mol-1] (layer).
+            grid: Numpy array defining the spectral grid [cm-1].
+            remove_pedestal: Flag specifying if a pedestal should be subtracted.
+            cut_off: Wavenumber cut-off distance [cm-1] from line centers.
+            out: Optional contiguous numpy array (layer, wavenumber) that the result is
+                 written to, so that the same buffer can be reused across calls.  Its
+                 wavenumber dimension may either have the size of the spectral grid,
+                 or the (vn - v0)*n_per_v points calculated by the c routines (see
+                 grid_bounds), which avoids a temporary copy.
+
+        Returns:
+            Numpy array of absorption coefficients [m2] (layer, wavenumber).  Unless out
+            is used, the wavenumber dimension contains the (vn - v0)*n_per_v calculated
+            points, which may extend past the end of the spectral grid.
+
+        Raises:
+            ValueError if the inputs do not have the same number of layers, or if out
+            does not have one of the allowed shapes.
+        """
+        temperature = ascontiguousarray(temperature, dtype=float64).ravel()
+        pressure = ascontiguousarray(pressure, dtype=float64).ravel()
+        volume_mixing_ratio = ascontiguousarray(volume_mixing_ratio, dtype=float64).ravel()
+        if not temperature.size == pressure.size == volume_mixing_ratio.size:
+            raise ValueError("temperature, pressure, and volume mixing ratio must have"
+                             " the same number of layers.")
+        v0, vn, n_per_v = grid_bounds(grid)
+        remove_pedestal = 1 if remove_pedestal else 0
+        k = _output_buffer((temperature.size, (vn - v0)*n_per_v), grid.size, out)
+
+        # Call the c function, which zeroes k before adding the lines to it.
+        library.absorption_profile(
+            c_int(temperature.size),
+            pressure,
+            temperature,
+            volume_mixing_ratio,
+            c_int(v0),
+            c_int(vn),
+            c_int(n_per_v),
+            k,
+            self._database_bytes,
+            self._formula_bytes,
+            c_int(cut_off),
+            c_int(remove_pedestal),
+        )
+        return _copy_output(k, out)
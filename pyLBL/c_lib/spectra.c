@@ -5,6 +5,16 @@
 #include "voigt.h"
 
 
+void reference_terms(LineParameter_t * parameter, Tips_t tips)
+{
+    double const c2 = 1.4387752;
+    double gref = exp((-c2*parameter->nu)/296.);
+    parameter->se_ref = 1. - gref;
+    parameter->q_ref = total_partition_function(tips, 296., parameter->local_iso_id - 1);
+    return;
+}
+
+
 void spectra(double temperature, double pressure, double abundance,
              LineParameter_t parameter, Tips_t tips, double * v, int n,
              int n_per_v, double * k, int cut_off, int remove_pedestal)
@@ -34,11 +44,10 @@ void spectra(double temperature, double pressure, double abundance,
 
     /*Stimulated emission.*/
     double g = exp((-c2*parameter.nu)/temperature);
-    double gref = exp((-c2*parameter.nu)/296.);
-    double se = (1. - g)/(1. - gref);
+    double se = (1. - g)/parameter.se_ref;
 
     /*Nonlte calculation of absorption coefficient modifiers.*/
-    double sq = total_partition_function(tips, 296., parameter.local_iso_id - 1)/
+    double sq = parameter.q_ref/
                 total_partition_function(tips, temperature, parameter.local_iso_id - 1);
 
     /*Line strength.*/
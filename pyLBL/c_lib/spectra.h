@@ -4,6 +4,10 @@
 #include "spectral_database.h"
 
 
+/*Calculate the temperature-independent line terms.*/
+void reference_terms(LineParameter_t * parameter, Tips_t tips);
+
+
 void spectra(double temperature, double pressure, double abundance,
              LineParameter_t parameter, Tips_t tip, double * v, int n,
              int n_per_v, double * k, int cut_off, int remove_pedestal);
@@ -15,6 +15,8 @@ typedef struct LineParameter
     double delta_air;
     int local_iso_id;
     double mass;
+    double se_ref; /*Stimulated emission term at the reference temperature.*/
+    double q_ref; /*Total partition function at the reference temperature.*/
 } LineParameter_t;
 
 
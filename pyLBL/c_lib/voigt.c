@@ -70,8 +70,54 @@ void voigt(double * dwno, int start, int end, double nu, double alpha, double ga
     double mf[6];
     double pf[6];
 
+    /*Far from the line center only the region 0 algorithm is used.  Find the
+      points where the wings end, so that the wings can be calculated in branch-free
+      loops that the compiler is able to vectorize.*/
+    int lower = start;
+    int upper = end + 1;
+    while (lower < upper)
+    {
+        int middle = lower + (upper - lower)/2;
+        if ((dwno[middle] - nu)*repwid <= -xlim0)
+        {
+            lower = middle + 1;
+        }
+        else
+        {
+            upper = middle;
+        }
+    }
+    int center_start = lower;
+    upper = end + 1;
+    while (lower < upper)
+    {
+        int middle = lower + (upper - lower)/2;
+        if ((dwno[middle] - nu)*repwid >= xlim0)
+        {
+            upper = middle;
+        }
+        else
+        {
+            lower = middle + 1;
+        }
+    }
+    int center_end = lower - 1;
+
     int i;
-    for (i=start; i<=end; ++i)
+    for (i=start; i<center_start; ++i)
+    {
+        /*region 0 algorithm (left wing).*/
+        double xi = (dwno[i] - nu)*repwid;
+        k[i] += sw*rsqrpi*repwid*(yrrtpi/(xi*xi + yq));
+    }
+    for (i=center_end+1; i<=end; ++i)
+    {
+        /*region 0 algorithm (right wing).*/
+        double xi = (dwno[i] - nu)*repwid;
+        k[i] += sw*rsqrpi*repwid*(yrrtpi/(xi*xi + yq));
+    }
+
+    for (i=center_start; i<=center_end; ++i)
     {
         double xi = (dwno[i] - nu)*repwid; /*loop over all points*/
         double abx = fabs(xi); /*|x|*/
@@ -5,7 +5,7 @@ from os.path import abspath, join
 from pathlib import Path
 from re import match
 
-from numpy import asarray, reshape
+from numpy import asarray, reshape, sort, unique
 from sqlalchemy import Column, create_engine, Float, ForeignKey, Integer, select, String
 from sqlalchemy.orm import declarative_base, Session
 
@@ -345,7 +345,7 @@ class Database(object):
         """
         with Session(self.engine, future=True) as session:
             stmt = select(MoleculeTable.ordinary_formula)
-            return [x[0] for x in session.execute(stmt).all()]
+            return session.execute(stmt).scalars().all()
 
     def gas(self, name):
         """Queries the database for all parameters needed to run a line-by-line calculation.
@@ -381,17 +381,17 @@ class Database(object):
         """
         with Session(self.engine, future=True) as session:
             id = self._molecule_id(session, name)
-            stmt = select(TipsTable).filter_by(molecule_id=id)
-            result = [x[0] for x in session.execute(stmt).all()]
-            if not result:
+            # Only select the needed columns, so that no table objects are created.
+            stmt = select(TipsTable.temperature, TipsTable.data) \
+                .filter_by(molecule_id=id).order_by(TipsTable.id)
+            result = asarray(session.execute(stmt).all())
+            if not result.size:
                 raise TipsDataNotFoundError(f"no tips data for {name}.")
-            data, temperature = [], []
-            for value in result:
-                data.append(value.data)
-                if value.temperature not in temperature:
-                    temperature.append(value.temperature)
-            data = reshape(asarray(data), (len(data)//len(temperature), len(temperature)))
-            temperature = asarray(temperature)
+
+            # Unique temperatures, in the order they are stored.
+            _, index = unique(result[:, 0], return_index=True)
+            temperature = result[sort(index), 0]
+            data = reshape(result[:, 1], (result.shape[0]//temperature.size, temperature.size))
             return temperature, data
 
     def arts_crossfit(self, name):
@@ -1,4 +1,4 @@
-from numpy import power, zeros
+from numpy import broadcast, power, zeros
 
 from .utils import BandedContinuum, Continuum, dry_air_number_density, LOSCHMIDT, P0, \
                    radiation_term, Spectrum, T0, T273
@@ -44,9 +44,9 @@ class NitrogenCIAFundamentalContinuum(Continuum):
 
         xtfac = (1./temperature - 1./272.)/(1./228. - 1./272.)
         ao2 = 1.294 - 0.4545*temperature/T0
-        c0 = zeros(self.data[0].data.size)
-        c0[1: -1] = self.data[0].data[1: -1]*power(self.data[1].data[1: -1] /
-                                                   self.data[0].data[1: -1], xtfac)
+        c0 = zeros(broadcast(xtfac, self.data[0].data).shape)
+        c0[..., 1: -1] = self.data[0].data[1: -1]*power(self.data[1].data[1: -1] /
+                                                        self.data[0].data[1: -1], xtfac)
         c0 = c0[:]/self.grid()[:]
         c1 = ao2*c0[:]
         c2 = (9./7.)*self.data[2].data[:]*c0[:]
@@ -1,4 +1,4 @@
-from numpy import arange, exp, log, power, zeros
+from numpy import arange, exp, log, power, where
 
 from .utils import air_number_density, BandedContinuum, Continuum, dry_air_number_density, \
                    LOSCHMIDT, P0, radiation_term, Spectrum, T0, T273
@@ -54,17 +54,15 @@ class OxygenCIANIRContinuum(Continuum):
 class OxygenCIANIR2Continuum(Continuum):
     def __init__(self, path=None):
         self._grid = arange(9100., 11002., 2.)
-        self.data = zeros(self._grid.size)
         hw1 = 58.96
         hw2 = 45.04
-        for i in range(self._grid.size):
-            dv1 = self._grid[i] - 9375.
-            dv2 = self._grid[i] - 9439.
-            damp1 = exp(dv1/176.1) if dv1 < 0. else 1.
-            damp2 = exp(dv2/176.1) if dv2 < 0. else 1.
-            o2inf = 0.31831*(((1.166e-04*damp1/hw1)/(1. + (dv1/hw1)*(dv1/hw1))) +
-                             ((3.086e-05*damp2/hw2)/(1. + (dv2/hw2)*(dv2/hw2))))*1.054
-            self.data[i] = o2inf/self._grid[i]
+        dv1 = self._grid - 9375.
+        dv2 = self._grid - 9439.
+        damp1 = where(dv1 < 0., exp(dv1/176.1), 1.)
+        damp2 = where(dv2 < 0., exp(dv2/176.1), 1.)
+        o2inf = 0.31831*(((1.166e-04*damp1/hw1)/(1. + (dv1/hw1)*(dv1/hw1))) +
+                         ((3.086e-05*damp2/hw2)/(1. + (dv2/hw2)*(dv2/hw2))))*1.054
+        self.data = o2inf/self._grid
 
     def spectra(self, temperature, pressure, vmr):
         no2 = dry_air_number_density(pressure, temperature, vmr)*vmr["O2"]
@@ -110,15 +108,10 @@ class OxygenVisibleContinuum(Continuum):
 class OxygenHerzbergContinuum(Continuum):
     def __init__(self, path=None):
         self._grid = arange(36000., 100010., 10.)
-        self.data = zeros(self._grid.size)
-        for i in range(self._grid.size):
-            if self._grid[i] <= 36000.:
-                self.data[i] = 0.
-            else:
-                corr = ((40000. - self._grid[i])/4000.)*7.917e-7 \
-                       if self._grid[i] <= 40000. else 0.
-                yratio = self._grid[i]/48811.0
-                self.data[i] = 6.884e-4*yratio*exp(-69.738*power(log(yratio), 2)) - corr
+        corr = where(self._grid <= 40000., ((40000. - self._grid)/4000.)*7.917e-7, 0.)
+        yratio = self._grid/48811.0
+        self.data = where(self._grid <= 36000., 0.,
+                          6.884e-4*yratio*exp(-69.738*power(log(yratio), 2)) - corr)
 
     def spectra(self, temperature, pressure, vmr):
         no2 = dry_air_number_density(pressure, temperature, vmr)*vmr["O2"]  # [cm-3].
@@ -1,7 +1,8 @@
+from functools import lru_cache
 from os.path import dirname, join, realpath
 
 from netCDF4 import Dataset
-from numpy import asarray, copy, exp, interp, where, zeros
+from numpy import arange, asarray, copy, exp, interp, searchsorted, where, zeros
 
 
 LOSCHMIDT = 2.6867775e19  # Loschmidt constant [cm-3]
@@ -79,6 +80,29 @@ def subgrid_bounds(grid, subgrid):
     return lower, upper
 
 
+@lru_cache(maxsize=None)
+def _read_variables(path):
+    """Reads all variables from an input dataset, so that it is only opened once.
+
+    Args:
+        path: Path to the netcdf dataset.
+
+    Returns:
+        Dictionary mapping variable names to their data and a dictionary describing
+        their wavenumber grid.
+    """
+    variables = {}
+    with Dataset(path, "r") as dataset:
+        # Read plain numpy arrays instead of masked arrays, since the data has no
+        # missing values.
+        dataset.set_auto_mask(False)
+        for name, v in dataset.variables.items():
+            grid = {x: v.getncattr("wavenumber_{}".format(x)) for x in
+                    ["lower_bound", "upper_bound", "resolution"]}
+            variables[name] = (v[:], grid)
+    return variables
+
+
 class Continuum(object):
     """Abstract class for gridded continuum coefficients."""
     def __init__(self, path):
@@ -125,12 +149,9 @@ class Spectrum(object):
             path: Path to the netcdf dataset.
             name: Name of the variable in the dataset.
         """
-        with Dataset(path, "r") as dataset:
-            v = dataset.variables[name]
-            self.data = copy(v[:])
-            self.grid = {x: v.getncattr("wavenumber_{}".format(x)) for x in
-                         ["lower_bound", "upper_bound", "resolution"]}
-#           self.units = v.getncattr("units")
+        data, grid = _read_variables(path)[name]
+        self.data = copy(data)
+        self.grid = dict(grid)
 
     def wavenumbers(self):
         """Calculates the wavenumber grid [cm-1] for the variable.
@@ -138,8 +159,7 @@ class Spectrum(object):
         Returns:
             A 1d numpy array containing the wavenumber grid [cm-1].
         """
-        return asarray([self.grid["lower_bound"] + i*self.grid["resolution"]
-                        for i in range(self.data.size)])
+        return self.grid["lower_bound"] + arange(self.data.size)*self.grid["resolution"]
 
 
 class BandedContinuum(object):
@@ -161,14 +181,60 @@ class BandedContinuum(object):
             temperature: Temperature [K].
             pressure: Pressure [Pa].
             vmr: Dictionary of volume mixing ratios [mol mol-1].
-            grid: Array containing the spectral grid [cm-1].
+            grid: Array containing the spectral grid [cm-1], in ascending order.
 
         Return:
             An array of continuum extinction [m-1].
         """
         s = zeros(grid.size)
         for band in self.bands:
-            s[:] += interp(grid, band.grid(),
-                           band.spectra(temperature, pressure*Pa_to_mb, vmr),
-                           left=0., right=0.)[:]*m_to_cm
+            # Only calculate bands that overlap the input grid, and only interpolate
+            # onto the part of the input grid that the band covers.
+            band_grid = band.grid()
+            lower = searchsorted(grid, band_grid[0], side="left")
+            upper = searchsorted(grid, band_grid[-1], side="right")
+            if lower >= upper:
+                continue
+            s[lower:upper] += interp(grid[lower:upper], band_grid,
+                                     band.spectra(temperature, pressure*Pa_to_mb, vmr),
+                                     left=0., right=0.)[:]*m_to_cm
+        return s
+
+    def spectra_profile(self, temperature, pressure, vmr, grid):
+        """Calculates the continum spectra for a profile of atmospheric layers and
+           interpolates them to the input grid.
+
+        Args:
+            temperature: Array of temperatures [K] (layer).
+            pressure: Array of pressures [Pa] (layer).
+            vmr: Dictionary of arrays of volume mixing ratios [mol mol-1] (layer).
+            grid: Array containing the spectral grid [cm-1], in ascending order.
+
+        Return:
+            An array of continuum extinction [m-1] (layer, wavenumber).
+        """
+        # Store the layers in column vectors, so that they broadcast against the bands'
+        # wavenumber grids.
+        temperature = asarray(temperature, dtype=float).reshape((-1, 1))
+        pressure = asarray(pressure, dtype=float).reshape((-1, 1))*Pa_to_mb
+        vmr = {x: asarray(y, dtype=float).reshape((-1, 1)) for x, y in vmr.items()}
+        s = zeros((temperature.shape[0], grid.size))
+        for band in self.bands:
+            band_grid = band.grid()
+            lower = searchsorted(grid, band_grid[0], side="left")
+            upper = searchsorted(grid, band_grid[-1], side="right")
+            if lower >= upper:
+                continue
+
+            # Linearly interpolate all layers at once, reusing the same weights.
+            x = grid[lower:upper]
+            i = searchsorted(band_grid, x, side="right") - 1
+            i = i.clip(0, band_grid.size - 2)
+            k = asarray(band.spectra(temperature, pressure, vmr))
+            slope = (k[:, i + 1] - k[:, i])/(band_grid[i + 1] - band_grid[i])
+            y = slope*(x - band_grid[i]) + k[:, i]
+
+            # Like numpy.interp, use the last value exactly at the band's upper bound.
+            y[:, x == band_grid[-1]] = k[:, -1:]
+            s[:, lower:upper] += y*m_to_cm
         return s
@@ -1,5 +1,7 @@
 from logging import getLogger
 
+from numpy import ravel, stack
+
 
 info = getLogger(__name__).info
 arts_installed = False
@@ -140,3 +142,22 @@ class PyArtsGas(object):
         self.ws.AgendaExecute(a=self.ws.propmat_clearsky_agenda)
         x = pyarts.arts.physics.number_density(pressure, temperature) * volume_mixing_ratio
         return self.ws.propmat_clearsky.value.data.value.flatten() / x
+
+    def absorption_coefficient_profile(self, temperature, pressure, volume_mixing_ratio,
+                                       grid, remove_pedestal=False, cut_off=25):
+        """Calculates absorption coefficient for a profile of atmospheric layers.
+
+        Args:
+            temperature: Numpy array of temperatures [K] (layer).
+            pressure: Numpy array of pressures [Pa] (layer).
+            volume_mixing_ratio: Numpy array of volume mixing ratios [mol mol-1] (layer).
+            grid: Numpy array defining the spectral grid [cm-1].
+            remove_pedestal: Flag specifying if a pedestal should be subtracted.
+            cut_off: Wavenumber cut-off distance [cm-1] from line centers.
+
+        Returns:
+            Numpy array of absorption coefficients [m2] (layer, wavenumber).
+        """
+        return stack([self.absorption_coefficient(t, p, x, grid, remove_pedestal, cut_off)
+                      for t, p, x in zip(ravel(temperature), ravel(pressure),
+                                         ravel(volume_mixing_ratio))])
@@ -1,9 +1,10 @@
 """Provides a simplified API for calculating molecular line spectra."""
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count
 
-from numpy import sum as npsum
-from numpy import unravel_index, zeros
-from xarray import DataArray, Dataset
+from numpy import newaxis, reshape, stack, zeros
+from xarray import Dataset
 
 from .atmosphere import Atmosphere
 from .database import AliasNotFoundError, CrossSectionNotFoundError, \
@@ -15,6 +16,10 @@ from .plugins import continua, cross_sections, molecular_lines
 kb = 1.38064852e-23  # Boltzmann constant [J K-1].
 
 
+# Output dataset metadata.
+Output = namedtuple("Output", ["dims", "dim_sizes", "mechanisms", "units"])
+
+
 def number_density(temperature, pressure, volume_mixing_ratio):
     """Calculates the number density using the ideal gas law.
 
@@ -121,9 +126,9 @@ class Spectroscopy(object):
         self.cross_sections_backend = cross_sections_backend
         self.cross_sections_engine = cross_sections[cross_sections_backend]
         self.cache = {}
+        self._molecules = None
 
         # Prepare metadata for the ouput xarray Dataset.
-        Output = namedtuple("Output", ["dims", "dim_sizes", "mechanisms", "units"])
         mechanisms = ["lines", "continuum", "cross_section"]
         dims = list(self.atmosphere.temperature.dims) + ["mechanism", "wavenumber", ]
         dim_sizes = \
@@ -139,9 +144,12 @@ class Spectroscopy(object):
         Returns:
             List of string molecule formulae available in the specral lines database.
         """
-        return self.lines_database.molecules()
+        if self._molecules is None:
+            # The database is only queried once, since its contents do not change.
+            self._molecules = tuple(self.lines_database.molecules())
+        return list(self._molecules)
 
-    def compute_absorption(self, output_format="all", remove_pedestal=None):
+    def compute_absorption(self, output_format="all", remove_pedestal=None, num_threads=1):
         """Computes absorption coefficient [m-1] at specified wavenumbers given temperature,
            pressure, and gas concentrations.
 
@@ -154,82 +162,141 @@ class Spectroscopy(object):
                            "total" - returns the total spectra.
             remove_pedestal: Flag that allows the user to not subtract off the
                              MT-CKD water vapor "pedestal" if desired.
+            num_threads: Number of threads used to calculate the gases concurrently.  If
+                         None, one thread is used for each available processor.
 
         Returns:
             An xarray Dataset of absorption coefficients [m-1].
         """
-        pressure = self.atmosphere.pressure.data.flat
-        temperature = self.atmosphere.temperature.data.flat
         if remove_pedestal is None:
             remove_pedestal = self.continua_backend == "mt_ckd"
-        beta = {}
-        for name, mole_fraction in self.atmosphere.gases.items():
-            varname = "{}_absorption".format(name)
-            beta[varname] = DataArray(zeros(self.output.dim_sizes), dims=self.output.dims,
-                                      attrs=self.output.units)
-            try:
-                # Grab cached spectral database data.
-                data = self.cache[name]
-            except KeyError:
-                # If not already cached, then cache it.
-                data = MoleculeCache(name, self.grid, self.lines_database,
-                                     self.lines_engine, self.continua_engine,
-                                     self.cross_sections_engine)
-                self.cache[name] = data
-            for i in range(self.atmosphere.temperature.data.size):
-                vmr = {x: y.data.flat[i] for x, y in self.atmosphere.gases.items()}
-                n = number_density(temperature[i], pressure[i],
-                                   mole_fraction.data.flat[i])
-                j = unravel_index(i, self.atmosphere.temperature.data.shape)
-
-                # Calculate lines.
-                if data.gas is not None:
-                    k = data.gas.absorption_coefficient(temperature[i], pressure[i],
-                                                        mole_fraction.data.flat[i], self.grid,
-                                                        remove_pedestal=remove_pedestal)
-                    indices = tuple(list(j) + [0, slice(None)])
-                    beta[varname].values[indices] = n*k[:self.grid.size]
-
-                # Calculate continua.
-                if data.gas_continua is not None:
-                    indices = tuple(list(j) + [1, slice(None)])
-                    for continuum in data.gas_continua:
-                        k = continuum.spectra(temperature[i], pressure[i], vmr, self.grid)
-                        beta[varname].values[indices] += k[:]
-
-                # Calculate the cross section.
-                if data.cross_section is not None:
-                    k = data.cross_section.absorption_coefficient(self.grid, temperature[i],
-                                                                  pressure[i])
-                    indices = tuple(list(j) + [2, slice(None)])
-                    beta[varname].values[indices] = n*k[:]
+        for name in self.atmosphere.gases.keys():
+            if name not in self.cache:
+                # If not already cached, then cache it.  This is done before any threads
+                # are started because reading the input datasets is not thread-safe.
+                self.cache[name] = MoleculeCache(name, self.grid, self.lines_database,
+                                                 self.lines_engine, self.continua_engine,
+                                                 self.cross_sections_engine)
+
+        # Flatten the mole fractions of all gases once, since they are needed by the
+        # continua of every gas.
+        vmr = {x: y.data.ravel() for x, y in self.atmosphere.gases.items()}
+
+        if num_threads is None:
+            num_threads = cpu_count() or 1
+        # The mechanisms are summed inside of the threads, so that it is done concurrently
+        # for each gas.
+        sum_mechanisms = output_format != "all"
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            futures = {"{}_absorption".format(name):
+                       executor.submit(self._gas_absorption, self.cache[name], mole_fraction,
+                                       vmr, remove_pedestal, sum_mechanisms)
+                       for name, mole_fraction in self.atmosphere.gases.items()}
+            beta = {x: y.result() for x, y in futures.items()}
         return self._create_output_dataset(beta, output_format)
 
+    def _gas_absorption(self, data, mole_fraction, vmr, remove_pedestal,
+                        sum_mechanisms=False):
+        """Computes absorption coefficient [m-1] for a single gas.
+
+        Args:
+            data: MoleculeCache object for the gas.
+            mole_fraction: xarray DataArray object for the gas mole fraction [mol mol-1].
+            vmr: Dictionary of arrays of all gas mole fractions [mol mol-1] at each point
+                 in the atmosphere.
+            remove_pedestal: Flag that allows the user to not subtract off the
+                             MT-CKD water vapor "pedestal" if desired.
+            sum_mechanisms: Flag that sums the absorption from all mechanisms.
+
+        Returns:
+            A numpy array of absorption coefficients [m-1].
+        """
+        pressure = self.atmosphere.pressure.data.ravel()
+        temperature = self.atmosphere.temperature.data.ravel()
+        shape = self.atmosphere.temperature.data.shape
+        size = shape + (self.grid.size,)
+
+        # If the mechanisms are summed, accumulate all of them in a single array instead
+        # of allocating space for each one.
+        if sum_mechanisms:
+            beta = zeros(size)
+            lines = continuum = cross_section = beta
+        else:
+            beta = zeros(self.output.dim_sizes)
+            lines, continuum, cross_section = [beta[..., i, :] for i in range(3)]
+
+        # Calculate the number density at every point in the atmosphere at once.
+        n = number_density(temperature, pressure, mole_fraction.data.ravel())
+
+        # Calculate lines for every point in the atmosphere at once.
+        if data.gas is not None:
+            if hasattr(data.gas, "absorption_coefficient_profile"):
+                k = data.gas.absorption_coefficient_profile(temperature, pressure,
+                                                            mole_fraction.data, self.grid,
+                                                            remove_pedestal=remove_pedestal)
+            else:
+                # Lines backend that can only calculate one layer at a time.
+                layers = zip(temperature, pressure, mole_fraction.data.ravel())
+                k = stack([data.gas.absorption_coefficient(t, p, x, self.grid,
+                                                           remove_pedestal=remove_pedestal)
+                           for t, p, x in layers])
+            # Scale in place to avoid temporary copies.
+            k = k[:, :self.grid.size]
+            k *= n[:, newaxis]
+            lines += reshape(k, size)
+
+        # Calculate continua for every point in the atmosphere at once.
+        if data.gas_continua is not None:
+            k = zeros((temperature.size, self.grid.size))
+            for x in data.gas_continua:
+                if hasattr(x, "spectra_profile"):
+                    k += x.spectra_profile(temperature, pressure, vmr, self.grid)
+                else:
+                    # Continuum backend that can only calculate one layer at a time.
+                    for i in range(temperature.size):
+                        k[i, :] += x.spectra(temperature[i], pressure[i],
+                                             {y: z[i] for y, z in vmr.items()}, self.grid)
+            continuum += reshape(k, size)
+
+        # Calculate the cross section for every point in the atmosphere at once.
+        if data.cross_section is not None:
+            if hasattr(data.cross_section, "absorption_coefficient_profile"):
+                k = data.cross_section.absorption_coefficient_profile(self.grid, temperature,
+                                                                      pressure)
+            else:
+                # Cross section backend that can only calculate one layer at a time.
+                k = stack([data.cross_section.absorption_coefficient(self.grid, t, p)
+                           for t, p in zip(temperature, pressure)])
+            k *= n[:, newaxis]
+            cross_section += reshape(k, size)
+        return beta
+
     def _create_output_dataset(self, absorption, output_format):
         """Creates an xarray Dataset with the calculated absorption values.
 
         Args:
-            absorption: Dictionary containing the absorptoin data.
+            absorption: Dictionary containing the absorptoin data as numpy arrays, which
+                        are already summed over the mechanisms unless the output
+                        format is "all".
             output_format: String describing how the data should be output.
 
         Returns:
             xarray Dataset containing the absorption in the desired format.
         """
-        wavenumber = DataArray(self.grid, dims=("wavenumber",), attrs={"units": "cm-1"})
-        data_vars = {"wavenumber": wavenumber, }
+        data_vars = {"wavenumber": (("wavenumber",), self.grid, {"units": "cm-1"}), }
         dims = list(self.output.dims)
         units = self.output.units
         if output_format == "all":
-            data_vars["mechanism"] = DataArray(self.output.mechanisms, dims=("mechanism",))
-            data_vars.update(absorption)
+            data_vars["mechanism"] = (("mechanism",), self.output.mechanisms)
+            data_vars.update({x: (dims, y, units) for x, y in absorption.items()})
         elif output_format == "gas":
             dims.pop(-2)
-            data_vars.update({x: DataArray(npsum(y.values, axis=-2), dims=dims, attrs=units)
-                              for x, y in absorption.items()})
+            data_vars.update({x: (dims, y, units) for x, y in absorption.items()})
         else:
             dims.pop(-2)
-            data = [DataArray(npsum(x.values, axis=-2), dims=dims, attrs=units) for x in
-                    absorption.values()]
-            data_vars["absorption"] = DataArray(sum([x.values for x in data]),
-                                                dims=dims, attrs=units)
+            # Accumulate the total in place so that only one extra array is allocated.
+            total = zeros(self.output.dim_sizes[:-2] + self.output.dim_sizes[-1:])
+            for x in absorption.values():
+                total += x
+            data_vars["absorption"] = (dims, total, units)
         return Dataset(data_vars=data_vars)
@@ -50,14 +50,15 @@ class HitranWebApi(object):
         """
         if self.proxy:
             install_opener(build_opener(ProxyHandler(self.proxy)))
-        response = urlopen(url)
         data = []
-        while True:
-            buf = response.read(chunk)
-            if not buf:
-                break
-            data.append(buf.decode("utf-8"))
-        return "".join(data)
+        with urlopen(url) as response:
+            while True:
+                buf = response.read(chunk)
+                if not buf:
+                    break
+                data.append(buf)
+        # Decode once at the end, since a multi-byte character may be split across reads.
+        return b"".join(data).decode("utf-8")
 
     def _download_file(self, prefix, name, chunk=64*1024*1024):
         """Downloads a data file from hitran.org.
@@ -26,10 +26,11 @@ class TipsWebApi(object):
             temperature: Numpy array of temperatures.
             data: Numpy array of data values.
         """
-        return self._parse_records(self._records(urlopen(self.url), molecule))
+        with urlopen(self.url) as response:
+            return self._parse_records(self._records(response, molecule))
 
     @staticmethod
-    def _ascii_table_records(response, block_size=512):
+    def _ascii_table_records(response, block_size=64*1024):
         """Reads the next line from an ascii table.
 
         Args:
@@ -1,3 +1,5 @@
+from os import environ
+
 from setuptools import Extension, setup
 
 
@@ -6,11 +8,17 @@ def c_gas_optics_lib():
     directory = "pyLBL/c_lib"
     src = ["{}/{}".format(directory, x) for x in
            ["absorption.c", "spectra.c", "spectral_database.c", "voigt.c"]]
+    compile_args = ["-O3",]
+    link_args = ["-lsqlite3", "-lm"]
+    if environ.get("PYLBL_USE_OPENMP"):
+        # Optionally calculate the atmospheric layers in parallel.
+        compile_args.append("-fopenmp")
+        link_args.append("-fopenmp")
     return Extension("pyLBL.c_lib.libabsorption",
                      sources=src,
                      include_dirs=[directory,],
-                     extra_compile_args=[],
-                     extra_link_args=["-lsqlite3", "-lm"])
+                     extra_compile_args=compile_args,
+                     extra_link_args=link_args)
 
 
 # Required dependencies.
@@ -1,9 +1,12 @@
 from collections import namedtuple
 from ftplib import FTP
-from os import environ
-from os.path import isfile
+from os import environ, replace
+from os.path import getsize, isdir, isfile, join
 
 from numpy import arange, asarray
+from pyLBL import Database, HitranWebApi, TipsWebApi
+from pyLBL.arts_crossfit import download
+from pyLBL.tips import TotalPartitionFunction
 import pytest
 from xarray import Dataset
 
@@ -25,7 +28,7 @@ def variable(data, units, standard_name):
     return (["layer",], data, {"units": units, "standard_name": standard_name})
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def molecule_names():
     names = {
         "H2O": "water_vapor",
@@ -40,17 +43,33 @@ def molecule_names():
     return names
 
 
-@pytest.fixture
+def frozen_grid(lower, upper, resolution):
+    """Create a read-only spectral grid that can safely be shared between tests.
+
+    Args:
+        lower: Grid lower bound (inclusive) [cm-1].
+        upper: Grid upper bound (exclusive) [cm-1].
+        resolution: Grid spacing [cm-1].
+
+    Returns:
+        A read-only Numpy array of wavenumbers [cm-1].
+    """
+    grid = arange(lower, upper, resolution)
+    grid.setflags(write=False)
+    return grid
+
+
+@pytest.fixture(scope="session")
 def spectral_grid():
-    return arange(1., 3250., 0.1)
+    return frozen_grid(1., 3250., 0.1)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def coarse_grid():
-    return arange(1., 3000., 1.)
+    return frozen_grid(1., 3000., 1.)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def atmosphere(molecule_names):
     """Set conditions for a default test atmosphere.
 
@@ -75,10 +94,14 @@ def atmosphere(molecule_names):
         molecule_names["O2"]: asarray([0.209, 0.209, 0.2090003, 0.208996]),
         molecule_names["N2"]: asarray([0.78, 0.78, 0.78, 0.78]),
     }
+    # The atmosphere is shared by every test in the session, so make sure that none of
+    # them can modify it.
+    for data in [pressure, temperature, *volume_mixing_ratio.values()]:
+        data.setflags(write=False)
     return Atmos(p=pressure, t=temperature, vmr=volume_mixing_ratio)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def atmosphere_dataset(atmosphere):
     """Create an xarray Dataset for a test atmosphere.
 
@@ -93,32 +116,109 @@ def atmosphere_dataset(atmosphere):
     data_vars = {
        "pressure": variable(atmosphere.p, "Pa", "air_pressure"),
        "temperature": variable(atmosphere.t, "K", "air_temperature"),
+       **{key: variable(value, "mol mol-1", f"mole_fraction_of_{key}_in_air")
+          for key, value in atmosphere.vmr.items()},
     }
-    for key, value in atmosphere.vmr.items():
-        standard_name = f"mole_fraction_of_{key}_in_air"
-        data_vars[key] = variable(value, "mol mol-1", standard_name)
     return Dataset(data_vars=data_vars)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def single_layer_atmosphere(atmosphere):
     data_vars = {
        "pressure": variable(atmosphere.p[-1:], "Pa", "air_pressure"),
        "temperature": variable(atmosphere.t[-1:], "K", "air_temperature"),
+       **{key: variable(value[-1:], "mol mol-1", f"mole_fraction_of_{key}_in_air")
+          for key, value in atmosphere.vmr.items()},
     }
-    for key, value in atmosphere.vmr.items():
-        standard_name = f"mole_fraction_of_{key}_in_air"
-        data_vars[key] = variable(value[-1:], "mol mol-1", standard_name)
     return Dataset(data_vars=data_vars)
 
 
-@pytest.fixture
-def downloaded_database():
+def cache_directory(request, tmp_path_factory, name):
+    """Creates a directory for downloaded test data.
+
+    Args:
+        request: pytest FixtureRequest object.
+        tmp_path_factory: pytest TempPathFactory object.
+        name: String name of the directory.
+
+    Returns:
+        Path to a directory in the pytest cache, so that it is reused across test
+        runs, or to a temporary directory if the cache plugin is disabled.
+    """
+    cache = getattr(request.config, "cache", None)
+    if cache is None:
+        return tmp_path_factory.mktemp(name)
+    return cache.mkdir(name)
+
+
+@pytest.fixture(scope="session")
+def downloaded_database(request, tmp_path_factory):
+    # Allow an existing copy of the database to be used instead.
+    if "PYLBL_TEST_DB" in environ:
+        return environ["PYLBL_TEST_DB"]
+
+    # Reuse a copy of the database in the working directory if there is one.
     name = "pyLBL-2-7-23.db"
     if isfile(name):
         return name
-    with FTP("ftp.gfdl.noaa.gov") as ftp:
+
+    # Otherwise keep the database in the pytest cache, so it is only downloaded once
+    # across test runs, no matter which directory the tests are run from.
+    path = join(cache_directory(request, tmp_path_factory, "database"), name)
+    if isfile(path):
+        return path
+    if "FTP_DB_DIR" not in environ:
+        pytest.skip("FTP_DB_DIR is not set, so the test database cannot be downloaded.")
+
+    # Download to a temporary file first, so that an interrupted download does not
+    # leave a truncated database behind that would be reused by later test runs.
+    partial = f"{path}.part"
+    # Use large blocks, since the default 8 KiB transfers are slow for a file this size.
+    block_size = 1 << 20
+    with FTP("ftp.gfdl.noaa.gov") as ftp, \
+         open(partial, "wb", buffering=block_size) as database:
         ftp.login()
         ftp.cwd(environ["FTP_DB_DIR"])
-        ftp.retrbinary(f"RETR {name}", open(name, "wb").write)
-    return name
+        ftp.voidcmd("TYPE I")
+        size = ftp.size(name)
+        ftp.retrbinary(f"RETR {name}", database.write, blocksize=block_size)
+    if size is not None and getsize(partial) != size:
+        raise IOError(f"incomplete download of {name}.")
+    replace(partial, path)
+    return path
+
+
+@pytest.fixture(scope="session")
+def database(downloaded_database):
+    return Database(downloaded_database)
+
+
+@pytest.fixture(scope="session")
+def cross_section_directory(request, tmp_path_factory):
+    # Keep the coefficients in the pytest cache, so they are only downloaded once
+    # across test runs.  They are extracted to a separate directory first, so that an
+    # interrupted download is not mistaken for a cached one.
+    directory = cache_directory(request, tmp_path_factory, "cross-sections")
+    coefficients = join(directory, "coefficients")
+    if not isdir(coefficients):
+        partial = join(directory, "partial")
+        download(partial)
+        replace(join(partial, "coefficients"), coefficients)
+    return directory
+
+
+@pytest.fixture(scope="session")
+def hitran_webapi():
+    if "HITRAN_API_KEY" not in environ:
+        pytest.skip("HITRAN_API_KEY is not set.")
+    return HitranWebApi(api_key=environ["HITRAN_API_KEY"])
+
+
+@pytest.fixture(scope="session")
+def water_vapor_tips():
+    return TipsWebApi().download("H2O")
+
+
+@pytest.fixture(scope="session")
+def water_vapor_partition_function(water_vapor_tips):
+    return TotalPartitionFunction("H2O", *water_vapor_tips)
@@ -1,14 +1,13 @@
 from os.path import getsize, join
 
-from numpy import log, max, sum
-from pyLBL.arts_crossfit import CrossSection, download
+from numpy import allclose, log, max, sum
+from pyLBL.arts_crossfit import CrossSection
 import pytest
 
 
-def test_artscrossfit(tmpdir, atmosphere, spectral_grid):
-    download(tmpdir)
+def test_artscrossfit(cross_section_directory, atmosphere, spectral_grid):
     formula = "CFC11"
-    xsec = CrossSection(formula, join(tmpdir, "coefficients", f"{formula}.nc"))
+    xsec = CrossSection(formula, join(cross_section_directory, "coefficients", f"{formula}.nc"))
     i = -1
     cross_section = xsec.absorption_coefficient(spectral_grid, atmosphere.t[i],
                                                 atmosphere.p[i])
@@ -17,7 +16,19 @@ def test_artscrossfit(tmpdir, atmosphere, spectral_grid):
     assert log(sum(cross_section)*dv) == pytest.approx(-46.04953693253788)
 
 
-def test_download(tmpdir):
+def test_artscrossfit_profile(cross_section_directory, atmosphere, spectral_grid):
+    formula = "CFC11"
+    xsec = CrossSection(formula, join(cross_section_directory, "coefficients", f"{formula}.nc"))
+    cross_section = xsec.absorption_coefficient_profile(spectral_grid, atmosphere.t,
+                                                        atmosphere.p)
+    assert cross_section.shape == (atmosphere.t.size, spectral_grid.size)
+    for layer in range(atmosphere.t.size):
+        reference = xsec.absorption_coefficient(spectral_grid, atmosphere.t[layer],
+                                                atmosphere.p[layer])
+        assert allclose(cross_section[layer, :], reference)
+
+
+def test_download(cross_section_directory):
     dataset = {
         "C2F6.nc": 6374380,
         "CH3CCl3.nc": 3995343,
@@ -57,6 +68,5 @@ def test_download(tmpdir):
         "HFC4310mee.nc": 5957528,
         "HFC236fa.nc": 394544,
     }
-    download(tmpdir)
     for key, value in dataset.items():
-        assert value == getsize(join(tmpdir, "coefficients", key))
+        assert value == getsize(join(cross_section_directory, "coefficients", key))
@@ -1,14 +1,12 @@
-from os import environ
 from os.path import normpath, sep
 
-from pyLBL import Database, HitranWebApi
+from pyLBL import Database
 
 
-def test_database():
+def test_database(hitran_webapi):
     molecules = ["H2O", "CO2", "CFC11"]
     database = Database(":memory:")
-    webapi = HitranWebApi(api_key=environ["HITRAN_API_KEY"])
-    database.create(webapi, molecules=molecules)
+    database.create(hitran_webapi, molecules=molecules)
 
     db_molecules = database.molecules()
     for molecule in molecules:
@@ -1,10 +1,9 @@
-from numpy import log, max
-from pyLBL import Database, Gas
+from numpy import array_equal, empty, full, log, max, nan
+from pyLBL import Gas
 import pytest
 
 
-def test_gas_optics(molecule_names, atmosphere, spectral_grid, downloaded_database):
-    database = Database(downloaded_database)
+def test_gas_optics(molecule_names, atmosphere, spectral_grid, database):
     formula = "H2O"
     vmr_name = molecule_names[formula]
     layer = -1
@@ -16,4 +15,74 @@ def test_gas_optics(molecule_names, atmosphere, spectral_grid, downloaded_databa
     k = k[:spectral_grid.size]
     assert log(max(k)) == pytest.approx(-48.159224953962244)
     dv = spectral_grid[1] - spectral_grid[0]
-    assert log(sum(k)*dv) == pytest.approx(-46.496121930910135)
+    assert log(k.sum()*dv) == pytest.approx(-46.496121930910135)
+
+
+def test_gas_optics_profile(molecule_names, atmosphere, spectral_grid, database):
+    formula = "H2O"
+    vmr_name = molecule_names[formula]
+    vmr = atmosphere.vmr[vmr_name]
+    gas = Gas(database, formula)
+    k = gas.absorption_coefficient_profile(temperature=atmosphere.t,
+                                           pressure=atmosphere.p,
+                                           volume_mixing_ratio=vmr,
+                                           grid=spectral_grid)
+    assert k.shape[0] == atmosphere.t.size
+    for layer in range(atmosphere.t.size):
+        reference = gas.absorption_coefficient(temperature=atmosphere.t[layer],
+                                               pressure=atmosphere.p[layer],
+                                               volume_mixing_ratio=vmr[layer],
+                                               grid=spectral_grid)
+        assert array_equal(k[layer, :], reference)
+
+
+def test_gas_optics_out(molecule_names, atmosphere, spectral_grid, database):
+    formula = "H2O"
+    vmr = atmosphere.vmr[molecule_names[formula]]
+    gas = Gas(database, formula)
+    reference = gas.absorption_coefficient_profile(atmosphere.t, atmosphere.p, vmr,
+                                                   spectral_grid)
+
+    # Reuse the same buffer for every layer.
+    buffer = full(reference.shape[1:], nan)
+    for layer in range(atmosphere.t.size):
+        k = gas.absorption_coefficient(atmosphere.t[layer], atmosphere.p[layer],
+                                       vmr[layer], spectral_grid, out=buffer)
+        assert k is buffer
+        assert array_equal(k, reference[layer, :])
+
+    buffer = full(reference.shape, nan)
+    k = gas.absorption_coefficient_profile(atmosphere.t, atmosphere.p, vmr,
+                                           spectral_grid, out=buffer)
+    assert k is buffer
+    assert array_equal(k, reference)
+
+    # Buffers the size of the spectral grid are also accepted.
+    buffer = empty(spectral_grid.shape)
+    k = gas.absorption_coefficient(atmosphere.t[0], atmosphere.p[0], vmr[0],
+                                   spectral_grid, out=buffer)
+    assert k is buffer
+    assert array_equal(k, reference[0, :spectral_grid.size])
+
+    buffer = empty((atmosphere.t.size,) + spectral_grid.shape)
+    k = gas.absorption_coefficient_profile(atmosphere.t, atmosphere.p, vmr,
+                                           spectral_grid, out=buffer)
+    assert k is buffer
+    assert array_equal(k, reference[:, :spectral_grid.size])
+
+    with pytest.raises(ValueError):
+        _ = gas.absorption_coefficient(atmosphere.t[0], atmosphere.p[0], vmr[0],
+                                       spectral_grid, out=empty(10))
+    with pytest.raises(ValueError):
+        _ = gas.absorption_coefficient_profile(atmosphere.t, atmosphere.p, vmr,
+                                               spectral_grid, out=reference[1:, :].copy())
+
+
+def test_gas_optics_profile_bad_layers(molecule_names, atmosphere, spectral_grid,
+                                       database):
+    formula = "H2O"
+    vmr = atmosphere.vmr[molecule_names[formula]]
+    gas = Gas(database, formula)
+    with pytest.raises(ValueError):
+        _ = gas.absorption_coefficient_profile(atmosphere.t, atmosphere.p[:1], vmr[:1],
+                                               spectral_grid)
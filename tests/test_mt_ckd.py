@@ -1,4 +1,4 @@
-from numpy import sum
+from numpy import allclose, arange, sum
 from pyLBL.mt_ckd.carbon_dioxide import CarbonDioxideContinuum
 from pyLBL.mt_ckd.nitrogen import NitrogenContinuum
 from pyLBL.mt_ckd.oxygen import OxygenContinuum
@@ -44,3 +44,18 @@ def test_mt_ckd_co2(atmosphere, molecule_names):
         for band, continuum in enumerate(continua.bands):
             spectra = continuum.spectra(atmosphere.t[index], atmosphere.p[index], vmr)
             assert values[molecule][band] == pytest.approx(sum(spectra))
+
+
+def test_mt_ckd_profile(atmosphere, molecule_names):
+    vmr = {key: atmosphere.vmr[value] for key, value in molecule_names.items()}
+    grid = arange(1., 60000., 1.)
+    for continua in [CarbonDioxideContinuum(), WaterVaporForeignContinuum(),
+                     WaterVaporSelfContinuum(), NitrogenContinuum(), OxygenContinuum(),
+                     OzoneContinuum()]:
+        spectra = continua.spectra_profile(atmosphere.t, atmosphere.p, vmr, grid)
+        assert spectra.shape == (atmosphere.t.size, grid.size)
+        for index in range(atmosphere.t.size):
+            reference = continua.spectra(atmosphere.t[index], atmosphere.p[index],
+                                         create_vmr_dict(atmosphere, molecule_names, index),
+                                         grid)
+            assert allclose(spectra[index, :], reference)
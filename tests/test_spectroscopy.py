@@ -1,10 +1,69 @@
-from numpy import array_equal, log, max, sum
-from pyLBL import Database, Spectroscopy
+from numpy import allclose, array_equal, asarray, log, newaxis
+from pyLBL import continua, cross_sections, molecular_lines, Spectroscopy
+from pyLBL.database import CrossSectionNotFoundError
 import pytest
 
 
-def test_spectroscopy(atmosphere_dataset, spectral_grid, downloaded_database):
-    database = Database(downloaded_database)
+class StubDatabase(object):
+    """Database stand-in for backends that do not read from a database."""
+    path = None
+
+    def arts_crossfit(self, name):
+        raise CrossSectionNotFoundError(f"no cross section for {name}.")
+
+
+class LayerGas(object):
+    """Lines backend that can only calculate one layer at a time."""
+    def __init__(self, lines_database, formula):
+        pass
+
+    def absorption_coefficient(self, temperature, pressure, volume_mixing_ratio, grid,
+                               remove_pedestal=False):
+        return 1.e-30*temperature*volume_mixing_ratio*grid/pressure
+
+
+class LayerContinuum(object):
+    """Continuum backend that can only calculate one layer at a time."""
+    def spectra(self, temperature, pressure, vmr, grid):
+        return 1.e-5*temperature*vmr["H2O"]*grid/pressure
+
+
+class ProfileContinuum(LayerContinuum):
+    """Continuum backend that can calculate all layers at once."""
+    def spectra_profile(self, temperature, pressure, vmr, grid):
+        return 1.e-5*(temperature*vmr["H2O"]/pressure)[:, newaxis]*grid
+
+
+class LayerCrossSection(object):
+    """Cross section backend that can only calculate one layer at a time."""
+    def __init__(self, formula, path):
+        pass
+
+    def absorption_coefficient(self, grid, temperature, pressure):
+        return 1.e-30*temperature*grid/pressure
+
+
+class ProfileCrossSection(LayerCrossSection):
+    """Cross section backend that can calculate all layers at once."""
+    def absorption_coefficient_profile(self, grid, temperature, pressure):
+        return 1.e-30*(temperature/pressure)[:, newaxis]*grid
+
+
+class CrossSectionDatabase(StubDatabase):
+    """Database stand-in that finds a cross section for every molecule."""
+    def arts_crossfit(self, name):
+        return None
+
+
+class ProfileGas(LayerGas):
+    """Lines backend that can calculate all layers at once."""
+    def absorption_coefficient_profile(self, temperature, pressure, volume_mixing_ratio,
+                                       grid, remove_pedestal=False):
+        x = temperature*asarray(volume_mixing_ratio).ravel()/pressure
+        return 1.e-30*x[:, newaxis]*grid
+
+
+def test_spectroscopy(atmosphere_dataset, spectral_grid, database):
     spec = Spectroscopy(atmosphere_dataset, spectral_grid, database)
     molecules = spec.list_molecules()
     assert molecules[0] == "H2O"
@@ -12,37 +71,83 @@ def test_spectroscopy(atmosphere_dataset, spectral_grid, downloaded_database):
     assert len(molecules) == 88
 
 
-def test_absorption(single_layer_atmosphere, coarse_grid, downloaded_database):
-    database = Database(downloaded_database)
+def test_absorption(single_layer_atmosphere, coarse_grid, database):
     spec = Spectroscopy(single_layer_atmosphere, coarse_grid, database)
     beta = spec.compute_absorption(output_format="total")
     beta = beta.data_vars["absorption"]
     wavenumber = beta.coords["wavenumber"]
-    assert max(beta.data) == pytest.approx(154.77712952851365)
-    assert log(sum(beta.data)) == pytest.approx(7.212513759327571)
+    assert beta.data.max() == pytest.approx(154.77712952851365)
+    assert log(beta.data.sum()) == pytest.approx(7.212513759327571)
     assert beta.attrs["units"] == "m-1"
     assert array_equal(wavenumber.data, coarse_grid)
     assert wavenumber.attrs["units"] == "cm-1"
 
 
-def test_spectroscopy_bad_lines_model(atmosphere_dataset, spectral_grid,
-                                      downloaded_database):
-    database = Database(downloaded_database)
+def test_absorption_output_formats(single_layer_atmosphere, coarse_grid, database):
+    spec = Spectroscopy(single_layer_atmosphere, coarse_grid, database)
+    beta = {x: spec.compute_absorption(output_format=x) for x in ["all", "gas", "total"]}
+    total = 0.
+    for name, gas in beta["gas"].data_vars.items():
+        assert allclose(gas.data, beta["all"][name].sum(dim="mechanism").data)
+        total += gas.data
+    assert allclose(total, beta["total"]["absorption"].data)
+
+
+@pytest.mark.parametrize("num_threads", [None, 2])
+def test_absorption_threads(atmosphere_dataset, coarse_grid, database, num_threads):
+    serial = Spectroscopy(atmosphere_dataset, coarse_grid, database).compute_absorption()
+    spec = Spectroscopy(atmosphere_dataset, coarse_grid, database)
+    beta = spec.compute_absorption(num_threads=num_threads)
+    assert beta.identical(serial)
+
+
+# The backends are looked up before the database is used, so the tests for unknown
+# backends do not need to open the database.
+def test_spectroscopy_bad_lines_model(atmosphere_dataset, spectral_grid):
     with pytest.raises(KeyError):
-        _ = Spectroscopy(atmosphere_dataset, spectral_grid, database, lines_backend="foo")
+        _ = Spectroscopy(atmosphere_dataset, spectral_grid, None, lines_backend="foo")
 
 
-def test_spectroscopy_bad_continua_model(atmosphere_dataset, spectral_grid,
-                                         downloaded_database):
-    database = Database(downloaded_database)
+def test_spectroscopy_bad_continua_model(atmosphere_dataset, spectral_grid):
     with pytest.raises(KeyError):
-        _ = Spectroscopy(atmosphere_dataset, spectral_grid, database,
+        _ = Spectroscopy(atmosphere_dataset, spectral_grid, None,
                          continua_backend="foo")
 
 
-def test_spectroscopy_bad_xsec_model(atmosphere_dataset, spectral_grid,
-                                     downloaded_database):
-    database = Database(downloaded_database)
+def test_spectroscopy_bad_xsec_model(atmosphere_dataset, spectral_grid):
     with pytest.raises(KeyError):
-        _ = Spectroscopy(atmosphere_dataset, spectral_grid, database,
+        _ = Spectroscopy(atmosphere_dataset, spectral_grid, None,
                          cross_sections_backend="foo")
+
+
+def test_layer_lines_backend(monkeypatch, atmosphere_dataset, coarse_grid):
+    monkeypatch.setitem(molecular_lines, "layer", LayerGas)
+    monkeypatch.setitem(molecular_lines, "profile", ProfileGas)
+    beta = [Spectroscopy(atmosphere_dataset, coarse_grid, StubDatabase(), lines_backend=x,
+                         continua_backend="mt_ckd").compute_absorption()
+            for x in ["layer", "profile"]]
+    assert allclose(beta[0]["H2O_absorption"].data, beta[1]["H2O_absorption"].data)
+    assert beta[0]["H2O_absorption"].data[..., 0, :].any()
+
+
+def test_layer_continua_backend(monkeypatch, atmosphere_dataset, coarse_grid):
+    monkeypatch.setitem(molecular_lines, "profile", ProfileGas)
+    for name, backend in [("layer", LayerContinuum), ("profile", ProfileContinuum)]:
+        monkeypatch.setitem(continua, name, {"H2OForeign": backend, "H2OSelf": backend})
+    beta = [Spectroscopy(atmosphere_dataset, coarse_grid, StubDatabase(),
+                         lines_backend="profile", continua_backend=x).compute_absorption()
+            for x in ["layer", "profile"]]
+    assert allclose(beta[0]["H2O_absorption"].data, beta[1]["H2O_absorption"].data)
+    assert beta[0]["H2O_absorption"].data[..., 1, :].any()
+
+
+def test_layer_cross_sections_backend(monkeypatch, atmosphere_dataset, coarse_grid):
+    monkeypatch.setitem(molecular_lines, "profile", ProfileGas)
+    monkeypatch.setitem(cross_sections, "layer", LayerCrossSection)
+    monkeypatch.setitem(cross_sections, "profile", ProfileCrossSection)
+    beta = [Spectroscopy(atmosphere_dataset, coarse_grid, CrossSectionDatabase(),
+                         lines_backend="profile", continua_backend="mt_ckd",
+                         cross_sections_backend=x).compute_absorption()
+            for x in ["layer", "profile"]]
+    assert allclose(beta[0]["H2O_absorption"].data, beta[1]["H2O_absorption"].data)
+    assert beta[0]["H2O_absorption"].data[..., 2, :].any()
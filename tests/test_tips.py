@@ -1,11 +1,6 @@
 import pytest
 
-from pyLBL import TipsWebApi
-from pyLBL.tips import TotalPartitionFunction
 
-
-def test_tips():
-    t, data = TipsWebApi().download("H2O")
-    tips = TotalPartitionFunction("H2O", t, data)
-    value = tips.total_partition_function(279.54, 1)
+def test_tips(water_vapor_partition_function):
+    value = water_vapor_partition_function.total_partition_function(279.54, 1)
     assert value == pytest.approx(160.2790023803711)